@@ -4487,9 +4487,9 @@ class TartubeApp(Gtk.Application):
         if version < 1004043:  # v1.4.043
 
             # This version removes an IV from media.Video objects
-            for media_data_obj in self.media_reg_dict.values():
-                if isinstance(media_data_obj, media.Video):
-                    del media_data_obj.file_dir
+            # (Nothing to do here; media.GenericMedia.__setstate__() discards
+            #   any IV that no longer exists)
+            pass
 
         if version < 2000012:  # v2.0.012
 
@@ -4535,7 +4535,7 @@ class TartubeApp(Gtk.Application):
             #   websites
             for media_data_obj in self.media_reg_dict.values():
                 if isinstance(media_data_obj, media.Video):
-                    media_data_obj.live_mode = 0
+                    media_data_obj.set_live_mode(0)
                 elif not isinstance(media_data_obj, media.Folder):
                     media_data_obj.rss = None
 
@@ -5575,17 +5575,26 @@ class TartubeApp(Gtk.Application):
 
         # Check each media data object's child list, and remove anything that
         #   should be removed
+        # (A damaged database might also list the same child more than once,
+        #   so rebuild the list directly, rather than calling
+        #   media.GenericContainer.del_child(); the counts are recalculated
+        #   below)
         for media_data_obj in self.media_reg_dict.values():
             if not isinstance(media_data_obj, media.Video):
 
-                remove_list = []
+                child_list = []
+                child_set = set()
                 for child_obj in media_data_obj.child_list:
 
-                    if child_obj.dbid in error_reg_dict:
-                        remove_list.append(child_obj)
+                    if not child_obj.dbid in error_reg_dict \
+                    and not child_obj in child_set:
+                        child_list.append(child_obj)
+                        child_set.add(child_obj)
 
-                for child_obj in remove_list:
-                    media_data_obj.child_list.remove(child_obj)
+                if len(child_list) != len(media_data_obj.child_list):
+                    media_data_obj.child_list = child_list
+                    # (Rebuild the cached set of children, among others)
+                    media_data_obj.reset_cache()
 
         # Recalculate counts for all channels/playlists/folders
         for dbid in self.media_name_dict.values():
@@ -8648,7 +8657,10 @@ class TartubeApp(Gtk.Application):
                 downloads.VideoDownloader.confirm_sim_video(), because the
                 video's parent containers (including the 'All Videos' folder)
                 should delay sorting their lists of child objects until that
-                calling function is ready. False when called by anything else
+                calling function is ready. Also True when called by
+                refresh.RefreshManager.refresh_from_default_destination(),
+                which sorts those lists after adding all of its new videos.
+                False when called by anything else
 
         Returns:
 
@@ -11744,61 +11756,36 @@ class TartubeApp(Gtk.Application):
         # If the media_list argument is empty, use the whole database.
         #   Otherwise, use only the specified media data objects (and any media
         #   data objects they contain)
-        if preserve_folder_flag and not plain_text_flag:
-
-            if media_list:
-
-                for media_data_obj in media_list:
-
-                    mini_dict = media_data_obj.prepare_export(
-                        include_video_flag,
-                        include_channel_flag,
-                        include_playlist_flag,
-                    )
-
-                    if mini_dict:
-                        db_dict[media_data_obj.dbid] = mini_dict
-
-            else:
-
-                for dbid in self.media_top_level_list:
-
-                    media_data_obj = self.media_reg_dict[dbid]
-
-                    mini_dict = media_data_obj.prepare_export(
-                        include_video_flag,
-                        include_channel_flag,
-                        include_playlist_flag,
-                    )
-
-                    if mini_dict:
-                        db_dict[media_data_obj.dbid] = mini_dict
-
+        if media_list:
+            root_list = media_list
         else:
+            root_list = [
+                self.media_reg_dict[dbid] for dbid in self.media_top_level_list
+            ]
 
-            if media_list:
+        if preserve_folder_flag and not plain_text_flag:
 
-                for media_data_obj in media_list:
+            for media_data_obj in root_list:
 
-                    db_dict = media_data_obj.prepare_flat_export(
-                        db_dict,
-                        include_video_flag,
-                        include_channel_flag,
-                        include_playlist_flag,
-                    )
+                mini_dict = media_data_obj.prepare_export(
+                    include_video_flag,
+                    include_channel_flag,
+                    include_playlist_flag,
+                )
 
-            else:
+                if mini_dict:
+                    db_dict[media_data_obj.dbid] = mini_dict
 
-                for dbid in self.media_top_level_list:
+        else:
 
-                    media_data_obj = self.media_reg_dict[dbid]
+            for media_data_obj in root_list:
 
-                    db_dict = media_data_obj.prepare_flat_export(
-                        db_dict,
-                        include_video_flag,
-                        include_channel_flag,
-                        include_playlist_flag,
-                    )
+                db_dict = media_data_obj.prepare_flat_export(
+                    db_dict,
+                    include_video_flag,
+                    include_channel_flag,
+                    include_playlist_flag,
+                )
 
         if not db_dict:
 
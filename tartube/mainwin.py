@@ -3512,7 +3512,7 @@ class MainWin(Gtk.ApplicationWindow):
                         else:
                             return 0
                     # ...but for everything else, the sorting algorithm is the
-                    #   same as for media.GenericRemoteContainer.do_sort(), in
+                    #   same as for media.GenericRemoteContainer.sort_key(), in
                     #   which we assume the website is sending us videos,
                     #   newest first
                     else:
@@ -5954,9 +5954,11 @@ class MainWin(Gtk.ApplicationWindow):
             [
                 media_data_obj.dbid,
                 media_data_obj.name,
-                media_data_obj.fetch_tooltip_text(
-                    self.app_obj,
-                    self.tooltip_max_len,
+                html.escape(
+                    media_data_obj.fetch_tooltip_text(
+                        self.app_obj,
+                        self.tooltip_max_len,
+                    ),
                 ),
                 pixbuf,
                 self.video_index_get_text(media_data_obj),
@@ -6029,9 +6031,11 @@ class MainWin(Gtk.ApplicationWindow):
                 [
                     media_data_obj.dbid,
                     media_data_obj.name,
-                    media_data_obj.fetch_tooltip_text(
-                        self.app_obj,
-                        self.tooltip_max_len,
+                    html.escape(
+                        media_data_obj.fetch_tooltip_text(
+                            self.app_obj,
+                            self.tooltip_max_len,
+                        ),
                     ),
                     pixbuf,
                     self.video_index_get_text(media_data_obj),
@@ -6047,9 +6051,11 @@ class MainWin(Gtk.ApplicationWindow):
                 [
                     media_data_obj.dbid,
                     media_data_obj.name,
-                    media_data_obj.fetch_tooltip_text(
-                        self.app_obj,
-                        self.tooltip_max_len,
+                    html.escape(
+                        media_data_obj.fetch_tooltip_text(
+                            self.app_obj,
+                            self.tooltip_max_len,
+                        ),
                     ),
                     pixbuf,
                     self.video_index_get_text(media_data_obj),
@@ -6349,9 +6355,11 @@ class MainWin(Gtk.ApplicationWindow):
         model.set(
             tree_iter,
             2,
-            media_data_obj.fetch_tooltip_text(
-                self.app_obj,
-                self.tooltip_max_len,
+            html.escape(
+                media_data_obj.fetch_tooltip_text(
+                    self.app_obj,
+                    self.tooltip_max_len,
+                ),
             ),
         )
 
@@ -14953,7 +14961,7 @@ class ComplexCatalogueItem(object):
 
             # Show the first line of the video description, or all of it,
             #   depending on settings
-            if self.video_obj.short:
+            if self.video_obj.get_short_descrip():
 
                 # Work with a list of lines, displaying either the fist line,
                 #   or all of them, as the user clicks the More/Less button
@@ -25,10 +25,11 @@
 
 
 # Import other modules
+import collections
 import datetime
-import functools
+import math
+import operator
 import os
-import re
 import time
 
 
@@ -39,6 +40,15 @@ import utils
 from mainapp import _
 
 
+# Integer codes for each type of media data object, stored in each class as
+#   ._type_code. Walking a large tree of media data objects is a little quicker
+#   when this code is tested, rather than calling isinstance()
+TYPE_VIDEO = 0
+TYPE_CHANNEL = 1
+TYPE_PLAYLIST = 2
+TYPE_FOLDER = 3
+
+
 # Classes
 
 
@@ -48,18 +58,95 @@ class GenericMedia(object):
     media.Playlist and media.Folder."""
 
 
+    # IVs are stored in slots, rather than in a dictionary, which saves a lot
+    #   of memory (and makes access a little quicker) when the database
+    #   contains many thousands of media data objects. Each class lists only
+    #   the IVs it adds; IVs are described in the __init__() functions of the
+    #   inheriting classes
+    __slots__ = (
+        'parent_obj',
+        'options_obj',
+        'dbid',
+        'name',
+        'nickname',
+        'dl_sim_flag',
+        'fav_flag',
+    )
+
+
+    # Standard class methods
+
+
+    def __getstate__(self):
+
+        """Called by pickle.dump(), when the Tartube database is saved.
+
+        IVs whose names begin with an underscore are used only to cache values
+        that can be calculated again; they are not saved in the database.
+        (The list of IVs to save is compiled for each class at the bottom of
+        this file.)
+
+        Returns:
+
+            A dictionary of IVs to save
+
+        """
+
+        try:
+            return dict(zip(self.db_iv_list, self.db_iv_getter(self)))
+
+        except AttributeError:
+
+            # (Failsafe: if an IV has not been set, save all the others)
+            return {
+                iv: getattr(self, iv) for iv in self.db_iv_list \
+                if hasattr(self, iv)
+            }
+
+
+    def __setstate__(self, state):
+
+        """Called by pickle.load(), when the Tartube database is loaded.
+
+        Restores the saved IVs, then resets the cache IVs (which are not saved
+        in the database).
+
+        Args:
+
+            state (dict): The dictionary of IVs returned by
+                self.__getstate__(). For a database created by an earlier
+                version of Tartube, this might include IVs that no longer
+                exist; they are discarded
+
+        """
+
+        for iv, value in state.items():
+            try:
+                setattr(self, iv, value)
+            except AttributeError:
+                pass
+
+        self.reset_cache()
+
+
     # Public class methods
 
+
+    def reset_cache(self):
+
+        """Called by self.__setstate__(), and by the __init__() function of
+        inheriting classes.
+
+        Resets IVs used only to cache values. Inheriting classes which use
+        such IVs override this function.
+        """
+
+        pass
+
+
     def get_type(self):
 
-        if isinstance(self, Channel):
-            return 'channel'
-        elif isinstance(self, Playlist):
-            return 'playlist'
-        elif isinstance(self, Folder):
-            return 'folder'
-        else:
-            return 'video'
+        return self._type_name
 
 
     # Set accessors
@@ -67,35 +154,33 @@ class GenericMedia(object):
 
     def set_dl_sim_flag(self, flag):
 
-        if flag:
-            self.dl_sim_flag = True
-        else:
-            self.dl_sim_flag = False
+        self.dl_sim_flag = bool(flag)
 
 
     def set_error(self, msg):
 
         # The media.Folder object has no error/warning IVs (and shouldn't
         #   receive any error/warning messages)
-        if not isinstance(self, Folder):
-            self.error_list.append(msg)
+        if self._type_code != TYPE_FOLDER:
+            # (While there are no messages, self.error_list is an empty tuple)
+            if self.error_list:
+                self.error_list.append(msg)
+            else:
+                self.error_list = [msg]
 
 
     def reset_error_warning(self):
 
         # The media.Folder object has no error/warning IVs (and shouldn't
         #   receive any error/warning messages)
-        if not isinstance(self, Folder):
-            self.error_list = []
-            self.warning_list = []
+        if self._type_code != TYPE_FOLDER:
+            self.error_list = ()
+            self.warning_list = ()
 
 
     def set_fav_flag(self, flag):
 
-        if flag:
-            self.fav_flag = True
-        else:
-            self.fav_flag = False
+        self.fav_flag = bool(flag)
 
 
     def set_nickname(self, nickname):
@@ -120,8 +205,13 @@ class GenericMedia(object):
 
         # The media.Folder object has no error/warning IVs (and shouldn't
         #   receive any error/warning messages)
-        if not isinstance(self, Folder):
-            self.warning_list.append(msg)
+        if self._type_code != TYPE_FOLDER:
+            # (While there are no messages, self.warning_list is an empty
+            #   tuple)
+            if self.warning_list:
+                self.warning_list.append(msg)
+            else:
+                self.warning_list = [msg]
 
 
 class GenericContainer(GenericMedia):
@@ -130,17 +220,131 @@ class GenericContainer(GenericMedia):
     media.Folder."""
 
 
+    __slots__ = (
+        'child_list',
+        'master_dbid',
+        'slave_dbid_list',
+        'dl_disable_flag',
+        'vid_count',
+        'bookmark_count',
+        'dl_count',
+        'fav_count',
+        'live_count',
+        'new_count',
+        'waiting_count',
+        '_child_set',
+        '_default_dir',
+        '_default_dir_downloads_dir',
+        '_relative_default_dir',
+        '_hidden_cache',
+        '_level',
+        '_fav_cache',
+        '_source_set',
+    )
+
+
     # Public class methods
 
 
+    def reset_cache(self):
+
+        """Called by GenericMedia.__setstate__(), by the __init__() function
+        of inheriting classes and by mainapp.TartubeApp.fix_integrity_db().
+
+        Resets IVs used only to cache values.
+        """
+
+        # A set containing the same objects as self.child_list, so that
+        #   membership can be tested without scanning a (possibly very long)
+        #   list
+        self._child_set = set(self.child_list)
+        # The full path to the sub-directory used by this container by
+        #   default, as returned by self.get_default_dir(), and the value of
+        #   mainapp.TartubeApp.downloads_dir at the time it was calculated
+        self._default_dir = None
+        self._default_dir_downloads_dir = None
+        # The path to the same sub-directory, relative to
+        #   mainapp.TartubeApp.downloads_dir, as returned by
+        #   self.get_relative_default_dir()
+        self._relative_default_dir = None
+        # The value returned by self.is_hidden() (None if not calculated yet)
+        self._hidden_cache = None
+        # The value returned by self.get_depth() (None if not calculated yet)
+        self._level = None
+        # True if this container (or any of its ancestors) is marked as
+        #   favourite, as returned by media.Video.ancestor_is_favourite() for
+        #   this container's child videos (None if not calculated yet)
+        self._fav_cache = None
+        # A set containing the source URLs of the child media.Video objects,
+        #   as used by media.Folder.check_duplicate_video() (None if not
+        #   compiled yet)
+        self._source_set = None
+
+
+    def reset_depth_cache(self):
+
+        """Called by self.set_parent_obj().
+
+        When this container is moved, the level occupied by this container
+        and all of its descendants may change. Resets the cached levels.
+        """
+
+        for container_obj in self.compile_all_containers([]):
+            container_obj._level = None
+
+
+    def reset_dir_cache(self):
+
+        """Called by self.set_name() and .set_parent_obj().
+
+        When this container is renamed or moved, the paths to its own
+        sub-directory and to the sub-directories of all its descendants
+        change. Resets the cached paths.
+        """
+
+        for container_obj in self.compile_all_containers([]):
+            container_obj._default_dir = None
+            container_obj._relative_default_dir = None
+
+
+    def reset_fav_cache(self):
+
+        """Called by self.set_fav_flag(), .set_parent_obj() and
+        media.GenericRemoteContainer.clone_properties().
+
+        When this container is moved (or marked/unmarked as favourite), the
+        value returned by media.Video.ancestor_is_favourite() for all
+        descendant videos may change. Resets the cached values.
+        """
+
+        for container_obj in self.compile_all_containers([]):
+            container_obj._fav_cache = None
+
+
+    def reset_hidden_cache(self):
+
+        """Called by self.set_parent_obj() and media.Folder.set_hidden_flag().
+
+        When this container is moved (or when a folder is hidden/unhidden),
+        the value returned by self.is_hidden() for this container and all its
+        descendants may change. Resets the cached values.
+        """
+
+        for container_obj in self.compile_all_containers([]):
+            container_obj._hidden_cache = None
+
+
     def compile_all_containers(self, container_list):
 
-        """Can be called by anything. Subsequently called by this function
-        recursively.
+        """Can be called by anything.
+
+        Appends to the specified list this container, then all descendant
+        media.Channel, media.Playlist and media.Folder objects, so they too can
+        be added to the list.
 
-        Appends to the specified list this container, then calls all this
-        function recursively for all media.Channel, media.Playlist and
-        media.Folder objects, so they too can be added to the list.
+        The tree is walked using a stack, rather than by recursion (so deep
+        trees can't exceed Python's recursion limit). Containers are added in
+        the same order as a recursive, depth-first walk.
 
         Args:
 
@@ -153,23 +357,30 @@ class GenericContainer(GenericMedia):
 
         """
 
-        container_list.append(self)
-        for child_obj in self.child_list:
+        stack = [self]
+        while stack:
+
+            container_obj = stack.pop()
+            container_list.append(container_obj)
 
-            if not isinstance(child_obj, Video):
-                child_obj.compile_all_containers(container_list)
+            # (Push children in reverse order, so they are popped in their
+            #   original order)
+            for child_obj in reversed(container_obj.child_list):
+                if child_obj._type_code != TYPE_VIDEO:
+                    stack.append(child_obj)
 
         return container_list
 
 
     def compile_all_videos(self, video_list):
 
-        """Can be called by anything. Subsequently called by this function
-        recursively.
+        """Can be called by anything.
+
+        Appends to the specified list all descendant objects that are
+        media.Video objects.
 
-        Appends to the specified list all child objects that are media.Video
-        objects, then calls this function recursively for all other child
-        objects, so they can add their children too.
+        The tree is walked using a stack, rather than by recursion. Videos are
+        added in the same order as a recursive, depth-first walk.
 
         Args:
 
@@ -181,23 +392,34 @@ class GenericContainer(GenericMedia):
 
         """
 
-        for child_obj in self.child_list:
+        # Channels and playlists can only contain videos, so their child lists
+        #   can be added in one go. Only folders need to be walked
+        if self._type_code != TYPE_FOLDER:
+            video_list.extend(self.child_list)
+            return video_list
+
+        stack = list(reversed(self.child_list))
+        while stack:
+
+            child_obj = stack.pop()
+            type_code = child_obj._type_code
 
-            if isinstance(child_obj, Video):
+            if type_code == TYPE_VIDEO:
                 video_list.append(child_obj)
+            elif type_code == TYPE_FOLDER:
+                stack.extend(reversed(child_obj.child_list))
             else:
-                child_obj.compile_all_videos(video_list)
+                video_list.extend(child_obj.child_list)
 
         return video_list
 
 
     def count_descendants(self, count_list):
 
-        """Can be called by anything. Subsequently called by this function
-        recursively.
+        """Can be called by anything.
 
-        Counts the number of child objects, and then calls this function
-        recursively in those child objects to count their child objects.
+        Counts the number of descendant objects. The tree is walked using a
+        stack, rather than by recursion.
 
         Args:
 
@@ -214,20 +436,37 @@ class GenericContainer(GenericMedia):
 
         """
 
-        for child_obj in self.child_list:
+        # (Count using local variables, which is quicker than updating the
+        #   list items, then update the list once at the end)
+        video_count = 0
+        channel_count = 0
+        playlist_count = 0
+        folder_count = 0
 
-            count_list[0] += 1
+        stack = [self]
+        while stack:
 
-            if isinstance(child_obj, Video):
-                count_list[1] += 1
-            else:
-                count_list = child_obj.count_descendants(count_list)
-                if isinstance(child_obj, Channel):
-                    count_list[2] += 1
-                elif isinstance(child_obj, Playlist):
-                    count_list[3] += 1
+            container_obj = stack.pop()
+            for child_obj in container_obj.child_list:
+
+                type_code = child_obj._type_code
+                if type_code == TYPE_VIDEO:
+                    video_count += 1
                 else:
-                    count_list[4] += 1
+                    stack.append(child_obj)
+                    if type_code == TYPE_CHANNEL:
+                        channel_count += 1
+                    elif type_code == TYPE_PLAYLIST:
+                        playlist_count += 1
+                    else:
+                        folder_count += 1
+
+        count_list[0] += video_count + channel_count + playlist_count \
+        + folder_count
+        count_list[1] += video_count
+        count_list[2] += channel_count
+        count_list[3] += playlist_count
+        count_list[4] += folder_count
 
         return count_list
 
@@ -252,15 +491,20 @@ class GenericContainer(GenericMedia):
         """
 
         # Check this is really one of our children
-        if not child_obj in self.child_list:
+        if not child_obj in self._child_set:
             return False
 
         else:
+            self._child_set.discard(child_obj)
             self.child_list.remove(child_obj)
 
-            if isinstance(child_obj, Video):
+            if child_obj._type_code == TYPE_VIDEO:
                 self.vid_count -= 1
 
+                # (Another child video might have the same source URL, so the
+                #   set must be compiled again)
+                self._source_set = None
+
                 if child_obj.bookmark_flag:
                     self.bookmark_count -= 1
 
@@ -300,40 +544,44 @@ class GenericContainer(GenericMedia):
 
             Text containing the channel/playlist/folder directory path and
                 the source (except for folders), ready for display in a tooltip
+                (the calling function must escape it, if the tooltip uses
+                Pango markup)
 
         """
 
-        text = '#' + str(self.dbid) + ':   ' + self.name + '\n\n'
+        # (Build the text from a list of parts, rather than by creating a new
+        #   string at every step)
+        part_list = ['#', str(self.dbid), ':   ', self.name, '\n\n']
 
-        if not isinstance(self, Folder):
+        if self._type_code != TYPE_FOLDER:
 
             translate_note = _(
                 'TRANSLATOR\'S NOTE: Source = video/channel/playlist URL',
             )
 
-            text += _('Source:') + '\n'
+            part_list.append(_('Source:') + '\n')
             if self.source is None:
-                text += '<' + _('unknown') + '>'
+                part_list.append('<' + _('unknown') + '>')
             else:
-                text += self.source
+                part_list.append(self.source)
 
-            text += '\n\n'
+            part_list.append('\n\n')
 
-        text += _('Location:') + '\n'
+        part_list.append(_('Location:') + '\n')
 
         location = self.get_default_dir(app_obj)
         if location is None:
-            text += '<' + _('unknown') + '>'
+            part_list.append('<' + _('unknown') + '>')
         else:
-            text += location
+            part_list.append(location)
 
         if self.master_dbid != self.dbid:
 
             dest_obj = app_obj.media_reg_dict[self.master_dbid]
-            text += '\n\n' + _('Download destination:') + ' ' + dest_obj.name
+            part_list.append('\n\n' + _('Download destination:') + ' ')
+            part_list.append(dest_obj.name)
 
-        # Need to escape question marks or we'll get a markup error
-        text = re.sub('&', '&amp;', text)
+        text = ''.join(part_list)
 
         # Apply a maximum line length, if required
         if max_length is not None:
@@ -366,49 +614,55 @@ class GenericContainer(GenericMedia):
         first = app_obj.match_first_chars
         ignore = app_obj.match_ignore_chars * -1
 
-        # Defend against two different of a name from the same video, one with
-        #   punctuation marks stripped away, and double quotes converted to
-        #   single quotes (thanks, YouTube!) by replacing those characters with
-        #   whitespace
-        # (After extensive testing, this is the only regex sequence I could
-        #   find that worked)
-        test_name = name[:]
-
-        # Remove punctuation
-        test_name = re.sub(r'\W+', ' ', test_name, flags=re.UNICODE)
-        # Also need to replace underline characters
-        test_name = re.sub(r'[\_\s]+', ' ', test_name)
-        # Also need to remove leading/trailing whitespace, in case the original
-        #   video name started/ended with a question mark or something like
-        #   that
-        test_name = re.sub(r'^\s+', '', test_name)
-        test_name = re.sub(r'\s+$', '', test_name)
+        test_name = utils.normalise_video_name(name)
+
+        # Names are compared using str.startswith(), so that a copy of each
+        #   child's name need not be sliced. The start of the test name is
+        #   sliced just once, here
+        if method == 'match_first':
+            test_prefix = test_name[:first]
+            # (If the test name is shorter than the number of characters to
+            #   match, the whole name must match)
+            short_flag = len(test_prefix) < first
+
+        elif method == 'ignore_last':
+            test_prefix = test_name[:ignore]
+            # (If anything is left, a matching name is exactly as long as
+            #   the test name; if not, it is no longer than the number of
+            #   characters to ignore)
+            test_len = len(test_name)
+            max_len = -ignore
 
         for child_obj in self.child_list:
-            if isinstance(child_obj, Video):
-
-                child_name = child_obj.name[:]
-                child_name = re.sub(
-                    r'\W+',
-                    ' ',
-                    child_name,
-                    flags=re.UNICODE,
-                )
-                child_name = re.sub(r'[\_\s]+', ' ', child_name)
-                child_name = re.sub(r'^\s+', '', child_name)
-                child_name = re.sub(r'\s+$', '', child_name)
-
-                if (
-                    method == 'exact_match' \
-                    and child_name == test_name
-                ) or (
-                    method == 'match_first' \
-                    and child_name[:first] == test_name[:first]
-                ) or (
-                    method == 'ignore_last' \
-                    and child_name[:ignore] == test_name[:ignore]
-                ):
-                    return child_obj
+            if child_obj._type_code == TYPE_VIDEO:
+
+                # (Each video's normalised name is cached, so it's only
+                #   calculated once, not every time this function is called)
+                child_name = child_obj._normalised_name
+                if child_name is None:
+                    child_name = utils.normalise_video_name(child_obj.name)
+                    child_obj._normalised_name = child_name
+
+                if method == 'exact_match':
+                    if child_name == test_name:
+                        return child_obj
+
+                elif method == 'match_first':
+                    if child_name.startswith(test_prefix) and (
+                        not short_flag or len(child_name) == len(test_prefix)
+                    ):
+                        return child_obj
+
+                elif method == 'ignore_last':
+                    if not ignore:
+                        # (If the number is zero, every name matches)
+                        return child_obj
+                    elif test_prefix:
+                        if len(child_name) == test_len \
+                        and child_name.startswith(test_prefix):
+                            return child_obj
+                    elif len(child_name) <= max_len:
+                        return child_obj
 
         # No matches found
         return None
@@ -427,24 +681,34 @@ class GenericContainer(GenericMedia):
         If this object has no parent, it is at level 1. If it has a parent
         object, and the parent itself has no parent, this object is at level 2.
 
+        The level is cached until this container (or one of its ancestors) is
+        moved.
+
         Returns:
 
             The container object's level
 
         """
 
-        if self.parent_obj is None:
-            return 1
+        if self._level is not None:
+            return self._level
 
-        else:
-            level = 1
-            parent_obj = self.parent_obj
+        level = 1
+        parent_obj = self.parent_obj
 
-            while parent_obj is not None:
-                level += 1
-                parent_obj = parent_obj.parent_obj
+        while parent_obj is not None:
+
+            # (An ancestor's cached level already counts its own ancestors)
+            if parent_obj._level is not None:
+                level += parent_obj._level
+                break
+
+            level += 1
+            parent_obj = parent_obj.parent_obj
 
-            return level
+        self._level = level
+
+        return level
 
 
     def is_hidden(self):
@@ -460,36 +724,57 @@ class GenericContainer(GenericMedia):
         Otherwise, return False. (media.Channel and media.Playlist objects
         can't be hidden directly.)
 
+        The result is cached until this container (or one of its ancestors)
+        is moved, hidden or unhidden.
+
         Returns:
 
             True or False.
 
         """
 
-        if isinstance(self, Folder) and self.hidden_flag:
-            return True
+        if self._hidden_cache is not None:
+            return self._hidden_cache
 
-        parent_obj = self.parent_obj
+        hidden_flag = False
+        if self._type_code == TYPE_FOLDER and self.hidden_flag:
+            hidden_flag = True
 
-        while parent_obj:
-            if isinstance(parent_obj, Folder) and parent_obj.hidden_flag:
-                return True
-            else:
-                parent_obj = parent_obj.parent_obj
+        else:
+
+            parent_obj = self.parent_obj
+            while parent_obj:
+
+                # (An ancestor's cached value already takes into account its
+                #   own ancestors)
+                if parent_obj._hidden_cache is not None:
+                    hidden_flag = parent_obj._hidden_cache
+                    break
+
+                elif parent_obj._type_code == TYPE_FOLDER \
+                and parent_obj.hidden_flag:
+                    hidden_flag = True
+                    break
+
+                else:
+                    parent_obj = parent_obj.parent_obj
+
+        self._hidden_cache = hidden_flag
 
-        return False
+        return hidden_flag
 
 
     def prepare_export(self, include_video_flag, include_channel_flag,
     include_playlist_flag):
 
-        """Called by mainapp.TartubeApp.export_from_db(). Subsequently called
-        by this function recursively.
+        """Called by mainapp.TartubeApp.export_from_db().
 
         Creates the dictionary, to be saved as a JSON file, described in the
         comments to that function. This function is called when we want to
         preserve the folder structure of the Tartube database.
 
+        The tree is walked using a stack, rather than by recursion.
+
         Args:
 
             include_video_flag (bool): If True, include videos. If False, don't
@@ -510,7 +795,7 @@ class GenericContainer(GenericMedia):
 
         # Ignore the types of media data object that we don't require (and all
         #   of their children)
-        media_type = self.get_type()
+        media_type = self._type_name
 
         # (This function should not be called for media.Video objects)
         if media_type == 'video' \
@@ -519,39 +804,6 @@ class GenericContainer(GenericMedia):
         or (media_type == 'folder' and self.fixed_flag):
             return {}
 
-        # This dictionary contains values for the children of this object
-        db_dict = {}
-
-        for child_obj in self.child_list:
-
-            if isinstance(child_obj, Video):
-
-                # (Don't bother exporting a video whose source URL is not
-                #   known)
-                if include_video_flag and child_obj.source is not None:
-
-                    mini_dict = {
-                        'type': 'video',
-                        'dbid': child_obj.dbid,
-                        'name': child_obj.name,
-                        'nickname': None,
-                        'source': child_obj.source,
-                        'db_dict': {},
-                    }
-
-                    db_dict[child_obj.dbid] = mini_dict
-
-            else:
-
-                mini_dict = child_obj.prepare_export(
-                    include_video_flag,
-                    include_channel_flag,
-                    include_playlist_flag,
-                )
-
-                if mini_dict:
-                    db_dict[child_obj.dbid] = mini_dict
-
         # This dictionary contains values for this object, and for the children
         #   of this object
         return_dict = {
@@ -560,12 +812,51 @@ class GenericContainer(GenericMedia):
             'name': self.name,
             'nickname': self.nickname,
             'source': None,
-            'db_dict': db_dict,
+            'db_dict': {},
         }
 
         if media_type != 'folder':
             return_dict['source'] = self.source
 
+        # Each item in the stack is a container object, and the dictionary
+        #   which contains values for the children of that object
+        stack = [(self, return_dict['db_dict'])]
+        while stack:
+
+            container_obj, db_dict = stack.pop()
+            for child_obj in container_obj.child_list:
+
+                if child_obj._type_code == TYPE_VIDEO:
+
+                    # (Don't bother exporting a video whose source URL is not
+                    #   known)
+                    if include_video_flag and child_obj.source is not None:
+                        db_dict[child_obj.dbid] = child_obj.get_export_dict()
+
+                else:
+
+                    child_type = child_obj._type_name
+                    if (child_type == 'channel' and not include_channel_flag) \
+                    or (
+                        child_type == 'playlist' and not include_playlist_flag
+                    ) or (child_type == 'folder' and child_obj.fixed_flag):
+                        continue
+
+                    mini_dict = {
+                        'type': child_type,
+                        'dbid': child_obj.dbid,
+                        'name': child_obj.name,
+                        'nickname': child_obj.nickname,
+                        'source': None,
+                        'db_dict': {},
+                    }
+
+                    if child_type != 'folder':
+                        mini_dict['source'] = child_obj.source
+
+                    db_dict[child_obj.dbid] = mini_dict
+                    stack.append((child_obj, mini_dict['db_dict']))
+
         # Procedure complete
         return return_dict
 
@@ -573,13 +864,14 @@ class GenericContainer(GenericMedia):
     def prepare_flat_export(self, db_dict, include_video_flag,
     include_channel_flag, include_playlist_flag):
 
-        """Called by mainapp.TartubeApp.export_from_db(). Subsequently called
-        by this function recursively.
+        """Called by mainapp.TartubeApp.export_from_db().
 
         Creates the dictionary, to be saved as a JSON file, described in the
         comments to that function. This function is called when we don't want
         to preserve the folder structure of the Tartube database.
 
+        The tree is walked using a stack, rather than by recursion.
+
         Args:
 
             db_dict (dict): The dictionary described in the comments in the
@@ -600,73 +892,55 @@ class GenericContainer(GenericMedia):
 
         """
 
-        # Ignore the types of media data object that we don't require (and all
-        #   of their children)
-        media_type = self.get_type()
+        stack = [self]
+        while stack:
 
-        # (This function should not be called for media.Video objects)
-        if media_type == 'video' \
-        or (media_type == 'channel' and not include_channel_flag) \
-        or (media_type == 'playlist' and not include_playlist_flag) \
-        or (media_type == 'folder' and self.fixed_flag):
-            return db_dict
+            container_obj = stack.pop()
+
+            # Ignore the types of media data object that we don't require (and
+            #   all of their children)
+            media_type = container_obj._type_name
 
-        # Add values to the dictionary
-        if media_type == 'channel' or media_type == 'playlist':
+            # (This function should not be called for media.Video objects)
+            if media_type == 'video' \
+            or (media_type == 'channel' and not include_channel_flag) \
+            or (media_type == 'playlist' and not include_playlist_flag) \
+            or (media_type == 'folder' and container_obj.fixed_flag):
+                continue
 
-            child_dict = {}
+            # Add values to the dictionary
+            if media_type == 'channel' or media_type == 'playlist':
 
-            for child_obj in self.child_list:
+                child_dict = {}
 
-                if isinstance(child_obj, Video):
+                for child_obj in container_obj.child_list:
 
                     # (Don't bother exporting a video whose source URL is not
                     #   known)
-                    if include_video_flag and child_obj.source is not None:
-
-                        child_mini_dict = {
-                            'type': 'video',
-                            'dbid': child_obj.dbid,
-                            'name': child_obj.name,
-                            'nickname': None,
-                            'source': child_obj.source,
-                            'db_dict': {},
-                        }
-
-                        child_dict[child_obj.dbid] = child_mini_dict
-
-                else:
-
-                    db_dict = child_obj.prepare_flat_export(
-                        db_dict,
-                        include_video_flag,
-                        include_channel_flag,
-                        include_playlist_flag,
-                    )
-
-            mini_dict = {
-                'type': media_type,
-                'dbid': self.dbid,
-                'name': self.name,
-                'nickname': self.nickname,
-                'source': self.source,
-                'db_dict': child_dict,
-            }
-
-            db_dict[self.dbid] = mini_dict
-
-        elif media_type == 'folder':
-
-            for child_obj in self.child_list:
-
-                if not isinstance(child_obj, Video):
-
-                    db_dict = child_obj.prepare_flat_export(
-                        db_dict,
-                        include_video_flag,
-                        include_channel_flag,
-                        include_playlist_flag,
-                    )
+                    if child_obj._type_code == TYPE_VIDEO \
+                    and include_video_flag \
+                    and child_obj.source is not None:
+                        child_dict[child_obj.dbid] \
+                        = child_obj.get_export_dict()
+
+                mini_dict = {
+                    'type': media_type,
+                    'dbid': container_obj.dbid,
+                    'name': container_obj.name,
+                    'nickname': container_obj.nickname,
+                    'source': container_obj.source,
+                    'db_dict': child_dict,
+                }
+
+                db_dict[container_obj.dbid] = mini_dict
+
+            elif media_type == 'folder':
+
+                # (Push children in reverse order, so they are popped in their
+                #   original order)
+                for child_obj in reversed(container_obj.child_list):
+                    if child_obj._type_code != TYPE_VIDEO:
+                        stack.append(child_obj)
 
         # Procedure complete
         return db_dict
@@ -674,41 +948,58 @@ class GenericContainer(GenericMedia):
 
     def recalculate_counts(self):
 
-        """Can be called by anything.
+        """Called by mainapp.TartubeApp.update_db() and .fix_integrity_db().
 
-        Recalculates all count IVs.
+        Recalculates all count IVs, repairing any that are wrong.
+
+        Otherwise, the count IVs are never recalculated. When a video's flags
+        change, functions like mainapp.TartubeApp.mark_video_downloaded() call
+        self.inc_dl_count(), .dec_dl_count() (etc) for each container
+        affected, so the child list does not need to be scanned.
         """
 
-        self.vid_count = 0
-        self.bookmark_count = 0
-        self.dl_count = 0
-        self.fav_count = 0
-        self.live_count = 0
-        self.new_count = 0
-        self.waiting_count = 0
+        # (Incrementing local variables is much quicker than incrementing
+        #   IVs, which matters for containers with thousands of videos)
+        vid_count = 0
+        bookmark_count = 0
+        dl_count = 0
+        fav_count = 0
+        live_count = 0
+        new_count = 0
+        waiting_count = 0
 
         for child_obj in self.child_list:
 
-            if isinstance(child_obj, Video):
-                self.vid_count += 1
+            if child_obj._type_code == TYPE_VIDEO:
+                vid_count += 1
 
                 if child_obj.bookmark_flag:
-                    self.bookmark_count += 1
+                    bookmark_count += 1
 
                 if child_obj.dl_flag:
-                    self.dl_count += 1
+                    dl_count += 1
 
                 if child_obj.fav_flag:
-                    self.fav_count += 1
+                    fav_count += 1
 
                 if child_obj.live_mode:
-                    self.live_count += 1
+                    live_count += 1
 
                 if child_obj.new_flag:
-                    self.new_count += 1
+                    new_count += 1
 
                 if child_obj.waiting_flag:
-                    self.waiting_count += 1
+                    waiting_count += 1
+
+        self.reset_counts(
+            vid_count,
+            bookmark_count,
+            dl_count,
+            fav_count,
+            live_count,
+            new_count,
+            waiting_count,
+        )
 
 
     # Set accessors
@@ -717,7 +1008,8 @@ class GenericContainer(GenericMedia):
     def reset_counts(self, vid_count, bookmark_count, dl_count, fav_count,
     live_count, new_count, waiting_count):
 
-        """Called by mainapp.TartubeApp.update_db().
+        """Called by mainapp.TartubeApp.update_db() and
+        self.recalculate_counts().
 
         When a database created by an earlier version of Tartube is loaded,
         the calling function updates IVs as required.
@@ -757,10 +1049,7 @@ class GenericContainer(GenericMedia):
 
     def set_dl_disable_flag(self, flag):
 
-        if flag:
-            self.dl_disable_flag = True
-        else:
-            self.dl_disable_flag = False
+        self.dl_disable_flag = bool(flag)
 
 
     def inc_fav_count(self):
@@ -835,13 +1124,7 @@ class GenericContainer(GenericMedia):
         """Called by self.set_master_dbid() only."""
 
         # (Failsafe: don't add the same value to self.slave_dbid_list)
-        match_flag = False
-        for slave_dbid in self.slave_dbid_list:
-            if slave_dbid == dbid:
-                match_flag = True
-                break
-
-        if not match_flag:
+        if not dbid in self.slave_dbid_list:
             self.slave_dbid_list.append(dbid)
 
 
@@ -850,13 +1133,18 @@ class GenericContainer(GenericMedia):
         """Called by mainapp.TartubeApp.fix_integrity_db() or by
         self.set_master_dbid() only."""
 
-        new_list = []
+        # (self.add_slave_dbid() doesn't add duplicates, so the dbid appears
+        #   no more than once)
+        try:
+            self.slave_dbid_list.remove(dbid)
+        except ValueError:
+            pass
+
 
-        for slave_dbid in self.slave_dbid_list:
-            if slave_dbid != dbid:
-                new_list.append(slave_dbid)
+    def set_fav_flag(self, flag):
 
-        self.slave_dbid_list = new_list.copy()
+        self.fav_flag = bool(flag)
+        self.reset_fav_cache()
 
 
     def set_name(self, name):
@@ -867,6 +1155,16 @@ class GenericContainer(GenericMedia):
             self.nickname = name
 
         self.name = name
+        self.reset_dir_cache()
+
+
+    def set_parent_obj(self, parent_obj):
+
+        self.parent_obj = parent_obj
+        self.reset_depth_cache()
+        self.reset_dir_cache()
+        self.reset_fav_cache()
+        self.reset_hidden_cache()
 
 
     # Get accessors
@@ -944,18 +1242,34 @@ class GenericContainer(GenericMedia):
 
         """
 
+        # Use the cached value, if the path has been calculated before
+        if new_name is None \
+        and self._default_dir is not None \
+        and self._default_dir_downloads_dir == app_obj.downloads_dir:
+            return self._default_dir
+
+        # (A deque, so that ancestor names can be added to the beginning of
+        #   the list in constant time)
         if new_name is not None:
-            dir_list = [new_name]
+            dir_list = collections.deque([new_name])
         else:
-            dir_list = [self.name]
+            dir_list = collections.deque([self.name])
 
         obj = self
         while obj.parent_obj:
 
             obj = obj.parent_obj
-            dir_list.insert(0, obj.name)
+            dir_list.appendleft(obj.name)
+
+        default_dir = os.path.abspath(
+            os.path.join(app_obj.downloads_dir, *dir_list),
+        )
 
-        return os.path.abspath(os.path.join(app_obj.downloads_dir, *dir_list))
+        if new_name is None:
+            self._default_dir = default_dir
+            self._default_dir_downloads_dir = app_obj.downloads_dir
+
+        return default_dir
 
 
     def get_relative_actual_dir(self, app_obj, new_name=None):
@@ -1026,18 +1340,29 @@ class GenericContainer(GenericMedia):
 
         """
 
+        # Use the cached value, if the path has been calculated before
+        if new_name is None and self._relative_default_dir is not None:
+            return self._relative_default_dir
+
+        # (A deque, so that ancestor names can be added to the beginning of
+        #   the list in constant time)
         if new_name is not None:
-            dir_list = [new_name]
+            dir_list = collections.deque([new_name])
         else:
-            dir_list = [self.name]
+            dir_list = collections.deque([self.name])
 
         obj = self
         while obj.parent_obj:
 
             obj = obj.parent_obj
-            dir_list.insert(0, obj.name)
+            dir_list.appendleft(obj.name)
+
+        relative_dir = os.path.join(*dir_list)
 
-        return os.path.join(*dir_list)
+        if new_name is None:
+            self._relative_default_dir = relative_dir
+
+        return relative_dir
 
 
 class GenericRemoteContainer(GenericContainer):
@@ -1045,6 +1370,14 @@ class GenericRemoteContainer(GenericContainer):
     """Base python class inherited by media.Channel and media.Playlist."""
 
 
+    __slots__ = (
+        'source',
+        'rss',
+        'error_list',
+        'warning_list',
+    )
+
+
     # Public class methods
 
 
@@ -1066,90 +1399,73 @@ class GenericRemoteContainer(GenericContainer):
 
         # Only media.Video objects can be added to a channel or playlist as a
         #   child object. Also, check this is not already a child object
-        if isinstance(child_obj, Video) or child_obj in self.child_list:
+        if child_obj._type_code == TYPE_VIDEO \
+        and not child_obj in self._child_set:
 
+            self._child_set.add(child_obj)
             self.child_list.append(child_obj)
             if not no_sort_flag:
                 self.sort_children()
 
-            if isinstance(child_obj, Video):
-                self.vid_count += 1
+            self.vid_count += 1
 
 
-    def do_sort(self, obj1, obj2):
+    def sort_children(self):
 
-        """Sorting function used by functools.cmp_to_key(), and called by
-        self.sort_children().
+        """Can be called by anything. For example, called by self.add_child().
 
-        Sort videos by upload time, with the most recent video first.
+        Sorts the child media.Video objects by upload time.
+        """
 
-        When downloading a channel or playlist, we assume that YouTube (etc)
-        supplies us with the most recent upload first. Therefore, when the
-        upload time is the same, sort by the order in youtube-dl fetches the
-        videos.
+        # A list with one item (or none) is already sorted
+        if len(self.child_list) < 2:
+            return
 
-        Args:
+        # Sort a copy of the list to prevent 'list modified during sort'
+        #   errors. If a child was added or removed in the meantime, sort it
+        #   again
+        # (sorted() returns a new list, so no further copy is needed, and the
+        #   list is sorted just once)
+        while True:
 
-            obj1, obj2 (media.Video) - Video objects being sorted
+            sort_list = sorted(self.child_list, key=self.sort_key)
 
-        Returns:
+            if len(sort_list) == len(self.child_list):
+                self.child_list = sort_list
+                break
 
-            -1 if obj1 comes first, 1 if obj2 comes first, 0 if they are equal
 
-        """
+    def sort_key(self, video_obj):
 
-        # Livestreams come before everything else
-        if obj1.live_mode > obj2.live_mode:
-            return -1
-        elif obj1.live_mode < obj2.live_mode:
-            return 1
-
-        # The video's index is not relevant unless sorting a playlist
-        elif isinstance(self, Playlist) \
-        and obj1.index is not None and obj2.index is not None:
-            if obj1.index < obj2.index:
-                return -1
-            else:
-                return 1
-
-        # Otherwise sort by upload time
-        elif obj1.upload_time is not None and obj2.upload_time is not None:
-            if obj1.upload_time > obj2.upload_time:
-                return -1
-            elif obj1.upload_time < obj2.upload_time:
-                return 1
-            elif obj1.receive_time is not None \
-            and obj2.receive_time is not None:
-                if obj1.receive_time < obj2.receive_time:
-                    return -1
-                elif obj1.receive_time > obj2.receive_time:
-                    return 1
-                else:
-                    return 0
-        else:
-            return 0
+        """Sorting function used as the key by list.sort(), and called by
+        self.sort_children().
 
+        Sort videos by upload time, with the most recent video first.
 
-    def sort_children(self):
+        When downloading a channel or playlist, we assume that YouTube (etc)
+        supplies us with the most recent upload first. Therefore, when the
+        upload time is the same, sort by the order in youtube-dl fetches the
+        videos (i.e. by receive time).
 
-        """Can be called by anything. For example, called by self.add_child().
+        Livestreams come before everything else. Videos whose upload (or
+        receive) time is not known come after those whose time is known.
 
-        Sorts the child media.Video objects by upload time.
-        """
+        (media.Playlist overrides this function, so that videos are sorted by
+        their index in the playlist, if known.)
 
-        # Sort a copy of the list to prevent 'list modified during sort'
-        #   errors
-        while True:
+        Args:
 
-            copy_list = self.child_list.copy()
-            copy_list.sort(key=functools.cmp_to_key(self.do_sort))
+            video_obj (media.Video) - The video object being sorted
 
-            if len(copy_list) == len(self.child_list):
-                self.child_list = copy_list.copy()
-                break
+        Returns:
 
+            A tuple which sorts in the order described above
 
-        self.child_list.sort(key=functools.cmp_to_key(self.do_sort))
+        """
+
+        # (The tuple is cached by the video, so it's not created again every
+        #   time the list is sorted)
+        return video_obj._sort_key or video_obj.get_sort_key()
 
 
     def get_livestreams(self, app_obj, live_mode=None):
@@ -1213,6 +1529,7 @@ class GenericRemoteContainer(GenericContainer):
         self.dl_sim_flag = other_obj.dl_sim_flag
         self.dl_disable_flag = other_obj.dl_disable_flag
         self.fav_flag = other_obj.fav_flag
+        self.reset_fav_cache()
 
         self.bookmark_count = other_obj.bookmark_count
         self.dl_count = other_obj.dl_count
@@ -1221,8 +1538,15 @@ class GenericRemoteContainer(GenericContainer):
         self.new_count = other_obj.new_count
         self.waiting_count = other_obj.waiting_count
 
-        self.error_list = other_obj.error_list.copy()
-        self.warning_list = other_obj.warning_list.copy()
+        if other_obj.error_list:
+            self.error_list = other_obj.error_list.copy()
+        else:
+            self.error_list = ()
+
+        if other_obj.warning_list:
+            self.warning_list = other_obj.warning_list.copy()
+        else:
+            self.warning_list = ()
 
 
     def set_rss(self, youtube_id):
@@ -1240,19 +1564,11 @@ class GenericRemoteContainer(GenericContainer):
 
         if not self.rss:
 
-            if isinstance(self, Channel):
-
-                self.rss = utils.convert_youtube_id_to_rss(
-                    'channel',
-                    youtube_id,
-                )
-
-            else:
-
-                self.rss = utils.convert_youtube_id_to_rss(
-                    'playlist',
-                    youtube_id,
-                )
+            # (self._type_name is 'channel' or 'playlist')
+            self.rss = utils.convert_youtube_id_to_rss(
+                self._type_name,
+                youtube_id,
+            )
 
 
     def set_source(self, source):
@@ -1282,6 +1598,45 @@ class Video(GenericMedia):
     """
 
 
+    __slots__ = (
+        'source',
+        'live_mode',
+        'was_live_flag',
+        'archive_flag',
+        'bookmark_flag',
+        'new_flag',
+        'waiting_flag',
+        'file_name',
+        'file_ext',
+        'dl_flag',
+        'file_size',
+        'upload_time',
+        'receive_time',
+        'duration',
+        'index',
+        'descrip',
+        'error_list',
+        'warning_list',
+        'dummy_flag',
+        'dummy_dir',
+        'dummy_path',
+        'dummy_format',
+        '_normalised_name',
+        '_tooltip_key',
+        '_tooltip_text',
+        '_sort_key',
+        '_priv_sort_key',
+    )
+
+
+    # Class IVs
+    # ---------
+    # Integer code for this type of media data object
+    _type_code = TYPE_VIDEO
+    # The string returned by self.get_type()
+    _type_name = 'video'
+
+
     # Standard class methods
 
 
@@ -1393,10 +1748,8 @@ class Video(GenericMedia):
         #   characters if necessary. (Set to None if the video description is
         #   not known)
         self.descrip = None
-        # Video short description - the first line in self.descrip, limited to
-        #   a certain number of characters (specifically,
-        #   mainwin.MainWin.very_long_string_max_len)
-        self.short = None
+        # (The video short description is not stored; it is created from
+        #   self.descrip by self.get_short_descrip(), when required)
 
         # List of error/warning messages generated the last time the video was
         #   checked or downloaded. Both set to empty lists if the video has
@@ -1405,8 +1758,11 @@ class Video(GenericMedia):
         # NB If an error/warning message is generated when downloading a
         #   channel or playlist, the message is stored in the media.Channel
         #   or media.Playlist object instead
-        self.error_list = []
-        self.warning_list = []
+        # NB While empty, each list is an empty tuple, so that a new list is
+        #   not created for every object; self.set_error() and
+        #   .set_warning() create the list, when the first message arrives
+        self.error_list = ()
+        self.warning_list = ()
 
         # IVs used only when the download operation is launched from the
         #   Classic Mode Tab
@@ -1423,6 +1779,13 @@ class Video(GenericMedia):
 #        #   use the format(s) specified by the General Options Manager)
 #        self.dummy_format = None
 
+
+        # IV list - caches
+        # ----------------
+        # IVs used only to cache values; not saved in the Tartube database
+        self.reset_cache()
+
+
         # Code
         # ----
 
@@ -1434,6 +1797,42 @@ class Video(GenericMedia):
     # Public class methods
 
 
+    def reset_cache(self):
+
+        """Called by GenericMedia.__setstate__() and by self.__init__().
+
+        Resets IVs used only to cache values.
+        """
+
+        # This video's name, as converted by utils.normalise_video_name() (or
+        #   None if not calculated yet). Used by
+        #   GenericContainer.find_matching_video()
+        self._normalised_name = None
+        # The text returned by self.fetch_tooltip_text(), and a tuple of the
+        #   values used to create it (or None if not fetched yet). The text is
+        #   recreated only when any of those values change
+        self._tooltip_key = None
+        self._tooltip_text = None
+        # The tuples returned by self.get_sort_key(), used when sorting the
+        #   parent container's list of child objects (or None if not
+        #   calculated yet)
+        self._sort_key = None
+        self._priv_sort_key = None
+
+
+    def reset_sort_key(self):
+
+        """Called by self.set_dl_flag(), .set_live_mode(),
+        .set_receive_time() and .set_upload_time().
+
+        When any of the IVs used to sort videos change, resets the cached
+        tuples returned by self.get_sort_key().
+        """
+
+        self._sort_key = None
+        self._priv_sort_key = None
+
+
     def ancestor_is_favourite(self):
 
         """Called by mainapp.TartubeApp.mark_video_downloaded().
@@ -1441,6 +1840,9 @@ class Video(GenericMedia):
         Checks whether any ancestor channel, playlist or folder is marked as
         favourite.
 
+        The result is cached by the parent container, so it is shared by all
+        of its child videos.
+
         Returns:
 
             True if the parent (or the parent's parent, and so on) is marked
@@ -1448,15 +1850,33 @@ class Video(GenericMedia):
 
         """
 
+        if not self.parent_obj:
+            return False
+
+        elif self.parent_obj._fav_cache is not None:
+            return self.parent_obj._fav_cache
+
+        fav_flag = False
         parent_obj = self.parent_obj
 
         while parent_obj:
-            if parent_obj.fav_flag:
-                return True
+
+            # (An ancestor's cached value already takes into account its own
+            #   ancestors)
+            if parent_obj._fav_cache is not None:
+                fav_flag = parent_obj._fav_cache
+                break
+
+            elif parent_obj.fav_flag:
+                fav_flag = True
+                break
+
             else:
                 parent_obj = parent_obj.parent_obj
 
-        return False
+        self.parent_obj._fav_cache = fav_flag
+
+        return fav_flag
 
 
     def fetch_tooltip_text(self, app_obj, max_length=None):
@@ -1481,6 +1901,29 @@ class Video(GenericMedia):
 
         if not self.dummy_flag:
 
+            if self.file_name is None:
+                path = None
+            else:
+                path = self.get_actual_path(app_obj)
+
+            parent_obj = self.parent_obj
+            if parent_obj:
+                parent_type = parent_obj._type_code
+                parent_name = parent_obj.name
+            else:
+                parent_type = None
+                parent_name = None
+
+            # The Video Catalogue fetches tooltips often, so use the cached
+            #   text, if none of the values it displays have changed
+            tooltip_key = (
+                self.name, self.live_mode, parent_type, parent_name,
+                self.source, path, max_length,
+            )
+
+            if tooltip_key == self._tooltip_key:
+                return self._tooltip_text
+
             translate_note = _(
                 'TRANSLATOR\'S NOTE: WAITING = livestream not started,' \
                 + ' LIVE = livestream started',
@@ -1493,35 +1936,49 @@ class Video(GenericMedia):
             else:
                 live_str = ''
 
-            text \
-            = ' #' + str(self.dbid) + live_str + ':   ' + self.name + '\n\n'
+            # (Build the text from a list of parts, rather than by creating a
+            #   new string at every step)
+            part_list = [
+                ' #', str(self.dbid), live_str, ':   ', self.name, '\n\n',
+            ]
 
-            if self.parent_obj:
+            if parent_obj:
 
-                if isinstance(self.parent_obj, Channel):
-                    text += _('Channel:') + ' '
-                elif isinstance(self.parent_obj, Playlist):
-                    text += _('Playlist:') + ' '
+                if parent_type == TYPE_CHANNEL:
+                    part_list.append(_('Channel:') + ' ')
+                elif parent_type == TYPE_PLAYLIST:
+                    part_list.append(_('Playlist:') + ' ')
                 else:
-                    text += _('Folder:') + ' '
+                    part_list.append(_('Folder:') + ' ')
 
-                text += self.parent_obj.name + '\n\n'
+                part_list.append(parent_name + '\n\n')
 
             translate_note = _(
                 'TRANSLATOR\'S NOTE 2: Source = video/channel/playlist URL',
             )
 
-            text += _('Source:') + '\n'
+            part_list.append(_('Source:') + '\n')
             if self.source is None:
-                text += '<' + _('unknown') + '>'
+                part_list.append('<' + _('unknown') + '>')
             else:
-                text += self.source
+                part_list.append(self.source)
 
-            text += '\n\n' + _('File:') + '\n'
-            if self.file_name is None:
-                text += '<' + _('unknown') + '>'
+            part_list.append('\n\n' + _('File:') + '\n')
+            if path is None:
+                part_list.append('<' + _('unknown') + '>')
             else:
-                text += self.get_actual_path(app_obj)
+                part_list.append(path)
+
+            text = ''.join(part_list)
+
+            # Apply a maximum line length, if required
+            if max_length is not None:
+                text = utils.tidy_up_long_descrip(text, max_length)
+
+            self._tooltip_key = tooltip_key
+            self._tooltip_text = text
+
+            return text
 
         else:
 
@@ -1569,18 +2026,12 @@ class Video(GenericMedia):
 
     def set_archive_flag(self, flag):
 
-        if flag:
-            self.archive_flag = True
-        else:
-            self.archive_flag = False
+        self.archive_flag = bool(flag)
 
 
     def set_bookmark_flag(self, flag):
 
-        if flag:
-            self.bookmark_flag = True
-        else:
-            self.bookmark_flag = False
+        self.bookmark_flag = bool(flag)
 
 
     def set_dl_flag(self, flag=False):
@@ -1589,6 +2040,7 @@ class Video(GenericMedia):
 
         if self.receive_time is None:
             self.receive_time = int(time.time())
+            self.reset_sort_key()
 
 
 #   def set_dl_sim_flag():      # Inherited from GenericMedia
@@ -1631,12 +2083,9 @@ class Video(GenericMedia):
 
     def set_duration(self, duration=None):
 
+        # (Round up fractional seconds)
         if duration is not None:
-            if duration != int(duration):
-                self.duration = int(duration) + 1
-            else:
-                self.duration = duration
-
+            self.duration = math.ceil(duration)
         else:
             self.duration = None
 
@@ -1663,6 +2112,7 @@ class Video(GenericMedia):
     def set_live_mode(self, mode):
 
         self.live_mode = mode
+        self.reset_sort_key()
 
 
     def set_mkv(self):
@@ -1683,14 +2133,12 @@ class Video(GenericMedia):
     def set_name(self, name):
 
         self.name = name
+        self._normalised_name = None
 
 
     def set_new_flag(self, flag):
 
-        if flag:
-            self.new_flag = True
-        else:
-            self.new_flag = False
+        self.new_flag = bool(flag)
 
 
 #   def set_options_obj():      # Inherited from GenericMedia
@@ -1699,16 +2147,28 @@ class Video(GenericMedia):
     def set_receive_time(self):
 
         self.receive_time = int(time.time())
+        self.reset_sort_key()
 
 
     def set_source(self, source):
 
+        # Update the parent's set of source URLs, if it has been compiled
+        parent_obj = self.parent_obj
+        if parent_obj and parent_obj._source_set is not None:
+
+            if self.source is None:
+                if source is not None:
+                    parent_obj._source_set.add(source)
+            else:
+                parent_obj._source_set = None
+
         self.source = source
 
 
     def set_upload_time(self, unix_time=None):
 
         self.upload_time = int(unix_time)
+        self.reset_sort_key()
 
 
     def set_video_descrip(self, descrip, max_length):
@@ -1718,8 +2178,9 @@ class Video(GenericMedia):
         Converts the video description into a list of lines, max_length
         characters long (longer lines are split into shorter ones).
 
-        Then uses the first line to set the short description, and uses all
-        lines to set the full description.
+        Then uses all lines to set the full description. (The short
+        description, which is just the first line, is created from the full
+        description when it's needed, by self.get_short_descrip() ).
 
         Args:
 
@@ -1732,27 +2193,19 @@ class Video(GenericMedia):
         if descrip:
 
             self.descrip = utils.tidy_up_long_descrip(descrip, max_length)
-            self.short = utils.shorten_string(descrip, max_length)
 
         else:
             self.descrip = None
-            self.short = None
 
 
     def set_waiting_flag(self, flag):
 
-        if flag:
-            self.waiting_flag = True
-        else:
-            self.waiting_flag = False
+        self.waiting_flag = bool(flag)
 
 
     def set_was_live_flag(self, flag):
 
-        if flag:
-            self.was_live_flag = True
-        else:
-            self.was_live_flag = False
+        self.was_live_flag = bool(flag)
 
 
     # Get accessors
@@ -1780,11 +2233,11 @@ class Video(GenericMedia):
 
         """
 
-        return os.path.abspath(
-            os.path.join(
-                self.parent_obj.get_actual_dir(app_obj),
-                self.file_name + self.file_ext,
-            ),
+        # (The parent's sub-directory is already an absolute, normalised
+        #   path, so os.path.abspath() need not be called again)
+        return os.path.join(
+            self.parent_obj.get_actual_dir(app_obj),
+            self.file_name + self.file_ext,
         )
 
 
@@ -1815,14 +2268,14 @@ class Video(GenericMedia):
         """
 
         # Add the full stop, if not supplied by the calling function
-        if not ext.find('.') == 0:
+        if not ext.startswith('.'):
             ext = '.' + ext
 
-        return os.path.abspath(
-            os.path.join(
-                self.parent_obj.get_actual_dir(app_obj),
-                self.file_name + ext,
-            ),
+        # (The parent's sub-directory is already an absolute, normalised
+        #   path, so os.path.abspath() need not be called again)
+        return os.path.join(
+            self.parent_obj.get_actual_dir(app_obj),
+            self.file_name + ext,
         )
 
 
@@ -1843,11 +2296,11 @@ class Video(GenericMedia):
 
         """
 
-        return os.path.abspath(
-            os.path.join(
-                self.parent_obj.get_default_dir(app_obj),
-                self.file_name + self.file_ext,
-            ),
+        # (The parent's sub-directory is already an absolute, normalised
+        #   path, so os.path.abspath() need not be called again)
+        return os.path.join(
+            self.parent_obj.get_default_dir(app_obj),
+            self.file_name + self.file_ext,
         )
 
 
@@ -1873,17 +2326,42 @@ class Video(GenericMedia):
         """
 
         # Add the full stop, if not supplied by the calling function
-        if not ext.find('.') == 0:
+        if not ext.startswith('.'):
             ext = '.' + ext
 
-        return os.path.abspath(
-            os.path.join(
-                self.parent_obj.get_default_dir(app_obj),
-                self.file_name + ext,
-            ),
+        # (The parent's sub-directory is already an absolute, normalised
+        #   path, so os.path.abspath() need not be called again)
+        return os.path.join(
+            self.parent_obj.get_default_dir(app_obj),
+            self.file_name + ext,
         )
 
 
+    def get_export_dict(self):
+
+        """Called by GenericContainer.prepare_export() and
+        .prepare_flat_export().
+
+        Returns the dictionary describing this video in a database export
+        file, in the form described in the comments to
+        mainapp.TartubeApp.export_from_db().
+
+        Returns:
+
+            The dictionary
+
+        """
+
+        return {
+            'type': 'video',
+            'dbid': self.dbid,
+            'name': self.name,
+            'nickname': None,
+            'source': self.source,
+            'db_dict': {},
+        }
+
+
     def get_file_size_string(self):
 
         """Can be called by anything.
@@ -1916,8 +2394,7 @@ class Video(GenericMedia):
         """
 
         if self.receive_time:
-            timestamp = datetime.datetime.fromtimestamp(self.receive_time)
-            return timestamp.strftime('%Y-%m-%d')
+            return utils.convert_unix_time_to_date_string(self.receive_time)
         else:
             return None
 
@@ -1935,11 +2412,99 @@ class Video(GenericMedia):
         """
 
         if self.receive_time:
-            return str(datetime.datetime.fromtimestamp(self.receive_time))
+            return utils.convert_unix_time_to_string(self.receive_time)
         else:
             return None
 
 
+    def get_short_descrip(self):
+
+        """Called by mainwin.ComplexCatalogueItem.update_video_descrip().
+
+        Returns the video short description: the first line of the video
+        description (not counting any empty lines at the beginning). Lines
+        in self.descrip have already been limited to a certain number of
+        characters by self.set_video_descrip().
+
+        The short description is sliced from self.descrip each time, rather
+        than being stored, so that each video holds just one copy of its
+        description. (Only the first line is scanned.)
+
+        Returns:
+
+            The short description, or None if the video description is not
+            known
+
+        """
+
+        if not self.descrip:
+            return None
+
+        # (Skip any empty lines at the beginning, then find the end of the
+        #   first line, without copying the rest of the description)
+        descrip = self.descrip
+        start = 0
+        while start < len(descrip) and descrip[start] == '\n':
+            start += 1
+
+        stop = descrip.find('\n', start)
+        if stop == -1:
+            return descrip[start:]
+        else:
+            return descrip[start:stop]
+
+
+    def get_sort_key(self, priv_flag=False):
+
+        """Called by GenericRemoteContainer.sort_key(),
+        media.Playlist.sort_key() and media.Folder.sort_key().
+
+        Returns the tuple used to sort this video among other videos:
+        livestreams first, then by upload time (most recent first), then by
+        receive time. Videos whose upload (or receive) time is not known come
+        after those whose time is known.
+
+        The tuples are cached, until self.reset_sort_key() is called.
+
+        Args:
+
+            priv_flag (bool): False to sort by receive time (oldest first),
+                the order in which the website supplies videos. True to sort
+                by receive time (most recent first), as in private folders
+                like 'All Videos'
+
+        Returns:
+
+            The tuple
+
+        """
+
+        upload_time = self.upload_time
+        receive_time = self.receive_time
+
+        if receive_time is None:
+            receive_key = 0
+        elif priv_flag:
+            receive_key = -receive_time
+        else:
+            receive_key = receive_time
+
+        sort_key = (
+            -self.live_mode,
+            upload_time is None,
+            0 if upload_time is None else -upload_time,
+            receive_time is None,
+            receive_key,
+        )
+
+        if priv_flag:
+            self._priv_sort_key = sort_key
+        else:
+            self._sort_key = sort_key
+
+        return sort_key
+
+
     def get_upload_date_string(self, pretty_flag=False):
 
         """Can be called by anything.
@@ -1962,25 +2527,25 @@ class Video(GenericMedia):
             return None
 
         elif not pretty_flag:
-            timestamp = datetime.datetime.fromtimestamp(self.upload_time)
-            return timestamp.strftime('%Y-%m-%d')
+            return utils.convert_unix_time_to_date_string(self.upload_time)
 
         else:
-            today = datetime.date.today()
-            today_str = today.strftime('%y%m%d')
-
-            yesterday = datetime.date.today() - datetime.timedelta(days=1)
-            yesterday_str = yesterday.strftime('%y%m%d')
+            # (The upload date is already formatted as YYYY-MM-DD, so compare
+            #   it against today's date and yesterday's date in the same
+            #   format)
+            testday_str = utils.convert_unix_time_to_date_string(
+                self.upload_time,
+            )
 
-            testday = datetime.datetime.fromtimestamp(self.upload_time)
-            testday_str = testday.strftime('%y%m%d')
+            today = datetime.date.today()
+            yesterday = today - datetime.timedelta(days=1)
 
-            if testday_str == today_str:
+            if testday_str == today.isoformat():
                 return _('Today')
-            elif testday_str == yesterday_str:
+            elif testday_str == yesterday.isoformat():
                 return _('Yesterday')
             else:
-                return testday.strftime('%Y-%m-%d')
+                return testday_str
 
 
     def get_upload_time_string(self):
@@ -1996,7 +2561,7 @@ class Video(GenericMedia):
         """
 
         if self.upload_time:
-            return str(datetime.datetime.fromtimestamp(self.upload_time))
+            return utils.convert_unix_time_to_string(self.upload_time)
         else:
             return None
 
@@ -2022,6 +2587,17 @@ class Channel(GenericRemoteContainer):
     """
 
 
+    __slots__ = ()
+
+
+    # Class IVs
+    # ---------
+    # Integer code for this type of media data object
+    _type_code = TYPE_CHANNEL
+    # The string returned by self.get_type()
+    _type_name = 'channel'
+
+
     # Standard class methods
 
 
@@ -2107,8 +2683,17 @@ class Channel(GenericRemoteContainer):
         # NB If an error/warning message is generated when downloading an
         #   individual video (not in a channel or playlist), the message is
         #   stored in the media.Video object
-        self.error_list = []
-        self.warning_list = []
+        # NB While empty, each list is an empty tuple, so that a new list is
+        #   not created for every object; self.set_error() and
+        #   .set_warning() create the list, when the first message arrives
+        self.error_list = ()
+        self.warning_list = ()
+
+
+        # IV list - caches
+        # ----------------
+        # IVs used only to cache values; not saved in the Tartube database
+        self.reset_cache()
 
 
         # Code
@@ -2128,10 +2713,10 @@ class Channel(GenericRemoteContainer):
 #   def del_child():                # Inherited from GenericContainer
 
 
-#   def do_sort():                  # Inherited from GenericRemoteContainer
+#   def sort_children():            # Inherited from GenericRemoteContainer
 
 
-#   def sort_children():            # Inherited from GenericRemoteContainer
+#   def sort_key():                 # Inherited from GenericRemoteContainer
 
 
     # Set accessors
@@ -2193,6 +2778,17 @@ class Playlist(GenericRemoteContainer):
     """
 
 
+    __slots__ = ()
+
+
+    # Class IVs
+    # ---------
+    # Integer code for this type of media data object
+    _type_code = TYPE_PLAYLIST
+    # The string returned by self.get_type()
+    _type_name = 'playlist'
+
+
     # Standard class methods
 
 
@@ -2278,8 +2874,17 @@ class Playlist(GenericRemoteContainer):
         # NB If an error/warning message is generated when downloading an
         #   individual video (not in a channel or playlist), the message is
         #   stored in the media.Video object
-        self.error_list = []
-        self.warning_list = []
+        # NB While empty, each list is an empty tuple, so that a new list is
+        #   not created for every object; self.set_error() and
+        #   .set_warning() create the list, when the first message arrives
+        self.error_list = ()
+        self.warning_list = ()
+
+
+        # IV list - caches
+        # ----------------
+        # IVs used only to cache values; not saved in the Tartube database
+        self.reset_cache()
 
 
         # Code
@@ -2299,10 +2904,42 @@ class Playlist(GenericRemoteContainer):
 #   def del_child():                # Inherited from GenericContainer
 
 
-#   def do_sort():                  # Inherited from GenericRemoteContainer
+#   def sort_children():            # Inherited from GenericRemoteContainer
+
 
+    def sort_key(self, video_obj):
 
-#   def sort_children():            # Inherited from GenericRemoteContainer
+        """Sorting function used as the key by list.sort(), and called by
+        self.sort_children().
+
+        Sort videos by their index in the playlist. Videos whose index is not
+        known come afterwards, sorted in the same way as
+        GenericRemoteContainer.sort_key().
+
+        Livestreams come before everything else.
+
+        Args:
+
+            video_obj (media.Video) - The video object being sorted
+
+        Returns:
+
+            A tuple which sorts in the order described above
+
+        """
+
+        # (The video caches the tuple used by
+        #   GenericRemoteContainer.sort_key(), which begins with the
+        #   livestream mode)
+        video_key = video_obj._sort_key or video_obj.get_sort_key()
+        index = video_obj.index
+
+        return (
+            video_key[0],
+            index is None,
+            0 if index is None else index,
+            video_key,
+        )
 
 
     # Set accessors
@@ -2377,6 +3014,23 @@ class Folder(GenericContainer):
     """
 
 
+    __slots__ = (
+        'fixed_flag',
+        'priv_flag',
+        'restrict_flag',
+        'temp_flag',
+        'hidden_flag',
+    )
+
+
+    # Class IVs
+    # ---------
+    # Integer code for this type of media data object
+    _type_code = TYPE_FOLDER
+    # The string returned by self.get_type()
+    _type_name = 'folder'
+
+
     # Standard class methods
 
 
@@ -2474,6 +3128,12 @@ class Folder(GenericContainer):
         self.waiting_count = 0
 
 
+        # IV list - caches
+        # ----------------
+        # IVs used only to cache values; not saved in the Tartube database
+        self.reset_cache()
+
+
         # Code
         # ----
 
@@ -2503,15 +3163,20 @@ class Folder(GenericContainer):
         """
 
         # Check this is not already a child object
-        if not child_obj in self.child_list:
+        if not child_obj in self._child_set:
 
+            self._child_set.add(child_obj)
             self.child_list.append(child_obj)
             if not no_sort_flag:
                 self.sort_children()
 
-            if isinstance(child_obj, Video):
+            if child_obj._type_code == TYPE_VIDEO:
                 self.vid_count += 1
 
+                if self._source_set is not None \
+                and child_obj.source is not None:
+                    self._source_set.add(child_obj.source)
+
 
     def check_duplicate_video(self, source):
 
@@ -2534,132 +3199,103 @@ class Folder(GenericContainer):
 
         """
 
-        for child_obj in self.child_list:
+        # The calling functions check many URLs in a row, so compile the set
+        #   of source URLs just once, rather than scanning the child list for
+        #   each URL
+        if self._source_set is None:
 
-            if isinstance(child_obj, Video) \
-            and child_obj.source is not None \
-            and child_obj.source == source:
-                # Duplicate found
-                return True
+            self._source_set = set(
+                child_obj.source for child_obj in self.child_list \
+                if child_obj._type_code == TYPE_VIDEO \
+                and child_obj.source is not None
+            )
 
-        # No duplicate found
-        return False
+        return source in self._source_set
 
 
 #   def del_child():                # Inherited from GenericContainer
 
 
-    def do_sort(self, obj1, obj2):
+    def sort_children(self):
 
-        """Sorting function used by functools.cmp_to_key(), and called by
-        self.sort_children().
+        """Can be called by anything. For example, called by self.add_child().
 
         Sorts the child media.Video, media.Channel, media.Playlist and
         media.Folder objects.
+        """
 
-        Firstly, sort by class - folders, channels/playlists, then videos.
+        # A list with one item (or none) is already sorted
+        if len(self.child_list) < 2:
+            return
 
-        Within folders, channels and playlists, sort alphabetically. Within
-        videos, sort by upload time.
+        # v1.0.002: At the end of a download operation, I am seeing 'list
+        #   modified during sort' errors. Not sure what the cause is, but we
+        #   can prevent it by sorting a copy of the list, rather than the list
+        #   itself. If the list itself is modified during the sort, sort it
+        #   again
+        # (sorted() returns a new list, so no further copy is needed, and the
+        #   list is sorted just once)
+        while True:
 
-        Args:
+            sort_list = sorted(self.child_list, key=self.sort_key)
 
-            obj1, obj2 (media.Video, media.Channel, media.Playlist or
-                media.Folder) - Media data objects being sorted
+            if len(sort_list) == len(self.child_list):
+                self.child_list = sort_list
+                break
 
-        Returns:
 
-            -1 if obj1 comes first, 1 if obj2 comes first, 0 if they are equal
+    def sort_key(self, media_data_obj):
 
-        """
+        """Sorting function used as the key by list.sort(), and called by
+        self.sort_children().
 
-        if str(obj1.__class__) == str(obj2.__class__) \
-        or (
-            isinstance(obj1, GenericRemoteContainer) \
-            and isinstance(obj2, GenericRemoteContainer)
-        ):
-            if isinstance(obj1, Video):
-
-                # Livestreams come before everything else
-                if obj1.live_mode > obj2.live_mode:
-                    return -1
-                elif obj1.live_mode < obj2.live_mode:
-                    return 1
-
-                # Otherwise sort by upload time, then by receive time
-                elif obj1.upload_time is not None \
-                and obj2.upload_time is not None:
-                    if obj1.upload_time > obj2.upload_time:
-                        return -1
-                    elif obj1.upload_time < obj2.upload_time:
-                        return 1
-                    elif obj1.receive_time is not None \
-                    and obj2.receive_time is not None:
-                        # In private folders (e.g. 'All Videos'), the most
-                        #   recently received video goes to the top of the list
-                        if self.priv_flag:
-                            if obj1.receive_time > obj2.receive_time:
-                                return -1
-                            elif obj1.receive_time < obj2.receive_time:
-                                return 1
-                            else:
-                                return 0
-                        # ...but for everything else, the sorting algorithm is
-                        #   the same as for GenericRemoteContainer.do_sort(),
-                        #   in which we assume the website is sending us
-                        #   videos, newest first
-                        else:
-                            if obj1.receive_time < obj2.receive_time:
-                                return -1
-                            elif obj1.receive_time > obj2.receive_time:
-                                return 1
-                            else:
-                                return 0
-                    else:
-                        return 0
-                else:
-                    return 0
-            else:
-                if obj1.name.lower() < obj2.name.lower():
-                    return -1
-                elif obj1.name.lower() > obj2.name.lower():
-                    return 1
-                else:
-                    return 0
-        else:
-            if isinstance(obj1, Folder):
-                return -1
-            elif isinstance(obj2, Folder):
-                return 1
-            elif isinstance(obj1, Channel) or isinstance(obj1, Playlist):
-                return -1
-            elif isinstance(obj2, Channel) or isinstance(obj2, Playlist):
-                return 1
-            else:
-                return 0
+        Sorts the child media.Video, media.Channel, media.Playlist and
+        media.Folder objects.
 
+        Firstly, sort by class - folders, channels/playlists, then videos.
 
-    def sort_children(self):
+        Within folders, channels and playlists, sort alphabetically. Within
+        videos, livestreams come first, then sort by upload time (most recent
+        first), then by receive time. Videos whose upload (or receive) time
+        is not known come after those whose time is known.
 
-        """Can be called by anything. For example, called by self.add_child().
+        Args:
 
-        Sorts the child media.Video, media.Channel, media.Playlist and
-        media.Folder objects.
-        """
+            media_data_obj (media.Video, media.Channel, media.Playlist or
+                media.Folder) - The media data object being sorted
 
-        # v1.0.002: At the end of a download operation, I am seeing 'list
-        #   modified during sort' errors. Not sure what the cause is, but we
-        #   can prevent it by sorting a copy of the list, rather than the list
-        #   itself. If the list itself is modified during the sort, sort it
-        #   again
-        while True:
+        Returns:
 
-            copy_list = self.child_list.copy()
-            copy_list.sort(key=functools.cmp_to_key(self.do_sort))
+            A tuple which sorts in the order described above
 
-            if len(copy_list) == len(self.child_list):
-                self.child_list = copy_list.copy()
-                break
+        """
+
+        type_code = media_data_obj._type_code
+
+        if type_code == TYPE_FOLDER:
+            return (0, media_data_obj.name.lower())
+
+        elif type_code != TYPE_VIDEO:
+            return (1, media_data_obj.name.lower())
+
+        # In private folders (e.g. 'All Videos'), the most recently received
+        #   video goes to the top of the list
+        # ...but for everything else, the sorting algorithm is the same as
+        #   GenericRemoteContainer.sort_key(), in which we assume the website
+        #   is sending us videos, newest first
+        # (Both tuples are cached by the video)
+        elif self.priv_flag:
+            return (
+                2,
+                media_data_obj._priv_sort_key \
+                or media_data_obj.get_sort_key(True),
+            )
+
+        else:
+            return (
+                2,
+                media_data_obj._sort_key or media_data_obj.get_sort_key(),
+            )
 
 
     # Set accessors
@@ -2673,10 +3309,8 @@ class Folder(GenericContainer):
 
     def set_hidden_flag(self, flag):
 
-        if flag:
-            self.hidden_flag = True
-        else:
-            self.hidden_flag = False
+        self.hidden_flag = bool(flag)
+        self.reset_hidden_cache()
 
 
 #   def set_options_obj():          # Inherited from GenericMedia
@@ -2703,3 +3337,19 @@ class Folder(GenericContainer):
         collapse neatly in my IDE."""
 
         pass
+
+
+# Compile, for each class, the list of IVs that are saved in the Tartube
+#   database, and a function that fetches all of their values at once (both
+#   used by GenericMedia.__getstate__() )
+# Cache IVs, whose names begin with an underscore, are not saved. Nor are the
+#   IVs only used by dummy media.Video objects (which are never added to the
+#   database, and whose IVs are only set when needed)
+for media_class in (Video, Channel, Playlist, Folder):
+    media_class.db_iv_list = tuple(
+        iv for ancestor_class in reversed(media_class.__mro__) \
+        for iv in ancestor_class.__dict__.get('__slots__', ()) \
+        if not iv.startswith('_') \
+        and iv not in ('dummy_dir', 'dummy_path', 'dummy_format')
+    )
+    media_class.db_iv_getter = operator.attrgetter(*media_class.db_iv_list)
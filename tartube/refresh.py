@@ -369,12 +369,14 @@ class RefreshManager(threading.Thread):
         #   in another channel/playlist/folder (for which this is the
         #   alternative download destination), then we can create a new
         #   media.Video object
+        stop_flag = False
         for relative_path in filter_list:
 
             # (If self.stop_refresh_operation() has been called, give up
-            #   immediately)
+            #   immediately, but still sort any new videos added so far)
             if not self.running_flag:
-                return
+                stop_flag = True
+                break
 
             filename, ext = os.path.splitext(relative_path)
 
@@ -437,8 +439,16 @@ class RefreshManager(threading.Thread):
                             '   ' + _('Non-match:') + ' '  + filename,
                         )
 
-                # Create a new media.Video object
-                video_obj = self.app_obj.add_video(media_data_obj, None)
+                # Create a new media.Video object. Sorting the parent
+                #   container's list of child objects (and the 'All Videos'
+                #   folder's list) is delayed until all new videos have been
+                #   added, so each list is only sorted once
+                video_obj = self.app_obj.add_video(
+                    media_data_obj,
+                    None,
+                    False,
+                    True,
+                )
                 video_path = os.path.abspath(
                     os.path.join(
                         dir_path,
@@ -485,6 +495,15 @@ class RefreshManager(threading.Thread):
                         '   ' + _('New video:') + ' '  + filename,
                     )
 
+        # Now that all new videos have been added (and their upload times,
+        #   etc, have been set), sort the child lists just once
+        if local_new_count:
+            media_data_obj.sort_children()
+            self.app_obj.fixed_all_folder.sort_children()
+
+        if stop_flag:
+            return
+
         # Check complete, display totals
         self.app_obj.main_win_obj.output_tab_write_stdout(
             1,
@@ -26,6 +26,7 @@ from gi.repository import Gtk, Gdk
 
 # Import other modules
 import datetime
+import functools
 import locale
 import math
 import os
@@ -43,6 +44,19 @@ import mainapp
 import media
 
 
+# Regexes used by normalise_video_name(), compiled once
+NORMALISE_PUNCT_REGEX = re.compile(r'\W+', flags=re.UNICODE)
+NORMALISE_SPACE_REGEX = re.compile(r'[\_\s]+')
+# Regex used by normalise_video_name() to detect non-ASCII strings
+#   (str.isascii() is not available before Python 3.7)
+NORMALISE_NON_ASCII_REGEX = re.compile(r'[^\x00-\x7f]')
+# Translation table used by normalise_video_name() for ASCII strings,
+#   converting every character that's not a letter or a digit into a space
+NORMALISE_ASCII_TABLE = str.maketrans(
+    {chr(i): ' ' for i in range(128) if not chr(i).isalnum()},
+)
+
+
 # Functions
 
 
@@ -423,6 +437,52 @@ def convert_seconds_to_string(seconds, short_flag=False):
         return str(datetime.timedelta(seconds=seconds))
 
 
+@functools.lru_cache(maxsize=4096)
+def convert_unix_time_to_date_string(unix_time):
+
+    """Called by media.Video.get_upload_date_string() and
+    .get_receive_date_string().
+
+    Converts a time, in Unix time, into a formatted date string.
+
+    The Video Catalogue asks for the same dates again and again, so recent
+    results are cached.
+
+    Args:
+
+        unix_time (int): The time to convert
+
+    Returns:
+
+        The converted string, e.g. '2020-12-31'
+
+    """
+
+    return datetime.datetime.fromtimestamp(unix_time).strftime('%Y-%m-%d')
+
+
+@functools.lru_cache(maxsize=4096)
+def convert_unix_time_to_string(unix_time):
+
+    """Called by media.Video.get_upload_time_string() and
+    .get_receive_time_string().
+
+    Converts a time, in Unix time, into a formatted date and time string.
+    Recent results are cached.
+
+    Args:
+
+        unix_time (int): The time to convert
+
+    Returns:
+
+        The converted string, e.g. '2020-12-31 23:59:59'
+
+    """
+
+    return str(datetime.datetime.fromtimestamp(unix_time))
+
+
 def convert_youtube_id_to_rss(media_type, youtube_id):
 
     """Can be called by anything; usually called by
@@ -971,6 +1031,43 @@ def is_youtube(url):
         return False
 
 
+def normalise_video_name(name):
+
+    """Called by media.GenericContainer.find_matching_video().
+
+    Defend against two different versions of a name from the same video, one
+    with punctuation marks stripped away, and double quotes converted to
+    single quotes (thanks, YouTube!) by replacing those characters with
+    whitespace.
+
+    Args:
+
+        name (str): The video name to convert
+
+    Returns:
+
+        The converted string
+
+    """
+
+    # Most names are pure ASCII, in which case a single translation (plus
+    #   a split to collapse the whitespace) gives the same result as the
+    #   regexes below, much more quickly
+    if not NORMALISE_NON_ASCII_REGEX.search(name):
+        return ' '.join(name.translate(NORMALISE_ASCII_TABLE).split())
+
+    # (After extensive testing, this is the only regex sequence I could find
+    #   that worked)
+    # Remove punctuation
+    name = NORMALISE_PUNCT_REGEX.sub(' ', name)
+    # Also need to replace underline characters
+    name = NORMALISE_SPACE_REGEX.sub(' ', name)
+    # Also need to remove leading/trailing whitespace, in case the original
+    #   video name started/ended with a question mark or something like that
+    # (All whitespace has been reduced to single space characters by now)
+    return name.strip(' ')
+
+
 def open_file(uri):
 
     """Can be called by anything.
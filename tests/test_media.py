@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2019-2020 A S Lewis
+#
+# This program is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free Software
+# Foundation, either version 3 of the License, or (at your option) any later
+# version.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or FITNESS
+# FOR A PARTICULAR PURPOSE. See the GNU General Public License for more
+# details.
+#
+# You should have received a copy of the GNU General Public License along with
+# this program. If not, see <http://www.gnu.org/licenses/>.
+
+
+"""Tests for the media data classes in media.py."""
+
+
+# Import other modules
+import os
+import pickle
+import sys
+import unittest
+
+
+# Import our modules
+# (Tartube's modules import each other by name, so add the module directory to
+#   the path, as the tartube script does)
+sys.path.insert(
+    0,
+    os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'tartube')),
+)
+import media
+
+
+# Classes
+
+
+class FakeApp(object):
+
+    """Stands in for mainapp.TartubeApp, providing only the IVs that media
+    data objects use."""
+
+
+    def __init__(self):
+
+        self.downloads_dir = os.path.abspath('tartube-data')
+        self.media_reg_dict = {}
+        self.media_reg_live_dict = {}
+        self.match_method = 'exact_match'
+        self.match_first_chars = 10
+        self.match_ignore_chars = 5
+
+
+class MediaSlotsTestCase(unittest.TestCase):
+
+    """The IVs of each media data class are declared in __slots__, which must
+    be kept in step with the IVs that each class actually sets. Call every
+    set accessor, then check that the object survives a trip through the
+    database (i.e. through pickle)."""
+
+
+    def setUp(self):
+
+        self.app_obj = FakeApp()
+
+        self.folder_obj = self.add_obj(
+            media.Folder(self.app_obj, 1, 'Folder'),
+        )
+        self.other_folder_obj = self.add_obj(
+            media.Folder(self.app_obj, 2, 'Other folder'),
+        )
+        self.channel_obj = self.add_obj(
+            media.Channel(self.app_obj, 3, 'Channel', self.folder_obj),
+        )
+        self.playlist_obj = self.add_obj(
+            media.Playlist(self.app_obj, 4, 'Playlist', self.folder_obj),
+        )
+        self.video_obj = self.add_obj(
+            media.Video(5, 'Video', self.playlist_obj),
+        )
+
+        self.obj_list = [
+            self.video_obj,
+            self.channel_obj,
+            self.playlist_obj,
+            self.folder_obj,
+        ]
+
+        # Arguments for every set accessor in media.py. If a new accessor is
+        #   added, it must be added here too
+        self.setter_arg_dict = {
+            'set_archive_flag': (True,),
+            'set_bookmark_flag': (True,),
+            'set_dl_disable_flag': (True,),
+            'set_dl_flag': (True,),
+            'set_dl_sim_flag': (True,),
+            'set_dummy': ('https://example.com/dummy', '/tmp', 'mp4'),
+            'set_dummy_path': ('/tmp/dummy.mp4',),
+            'set_duration': (60,),
+            'set_error': ('Error message',),
+            'set_fav_flag': (True,),
+            'set_file': ('video', '.mp4'),
+            'set_file_size': (1024,),
+            'set_hidden_flag': (True,),
+            'set_index': (1,),
+            'set_live_mode': (1,),
+            'set_master_dbid': (self.app_obj, self.other_folder_obj.dbid),
+            'set_mkv': (),
+            'set_name': ('New name',),
+            'set_new_flag': (True,),
+            'set_nickname': ('Nickname',),
+            'set_options_obj': (None,),
+            'set_parent_obj': (self.other_folder_obj,),
+            'set_receive_time': (),
+            'set_rss': ('abcdef',),
+            'set_source': ('https://example.com/source',),
+            'set_upload_time': (1600000000,),
+            'set_video_descrip': ('First line\nSecond line', 80),
+            'set_waiting_flag': (True,),
+            'set_warning': ('Warning message',),
+            'set_was_live_flag': (True,),
+        }
+
+
+    def add_obj(self, media_data_obj):
+
+        self.app_obj.media_reg_dict[media_data_obj.dbid] = media_data_obj
+        return media_data_obj
+
+
+    def get_slot_list(self, media_data_obj):
+
+        return [
+            iv for ancestor_class in type(media_data_obj).__mro__ \
+            for iv in ancestor_class.__dict__.get('__slots__', ())
+        ]
+
+
+    def convert_value(self, value):
+
+        # Media data objects are copied by pickle, so compare their .dbids
+        if isinstance(value, media.GenericMedia):
+            return ('media', value.dbid)
+        elif isinstance(value, (list, tuple)):
+            return [self.convert_value(item) for item in value]
+        elif isinstance(value, dict):
+            return {
+                key: self.convert_value(item) for key, item in value.items()
+            }
+        else:
+            return value
+
+
+    def check_all_slots_set(self, media_data_obj):
+
+        for iv in self.get_slot_list(media_data_obj):
+
+            # (The IVs used by dummy media.Video objects are only set when
+            #   media.Video.set_dummy() is called)
+            if iv in ('dummy_dir', 'dummy_path', 'dummy_format') \
+            and not media_data_obj.dummy_flag:
+                continue
+
+            self.assertTrue(
+                hasattr(media_data_obj, iv),
+                '{} IV \'{}\' is not set'.format(
+                    media_data_obj.get_type(),
+                    iv,
+                ),
+            )
+
+
+    def test_init(self):
+
+        for media_data_obj in self.obj_list:
+            self.check_all_slots_set(media_data_obj)
+
+
+    def test_setters(self):
+
+        for media_data_obj in self.obj_list:
+
+            for func_name in sorted(dir(media_data_obj)):
+
+                if not func_name.startswith('set_'):
+                    continue
+
+                self.assertIn(
+                    func_name,
+                    self.setter_arg_dict,
+                    'No test arguments for {}.{}()'.format(
+                        type(media_data_obj).__name__,
+                        func_name,
+                    ),
+                )
+
+                getattr(media_data_obj, func_name)(
+                    *self.setter_arg_dict[func_name]
+                )
+
+            self.check_all_slots_set(media_data_obj)
+
+
+    def test_pickle(self):
+
+        for media_data_obj in self.obj_list:
+
+            for func_name in sorted(dir(media_data_obj)):
+                if func_name.startswith('set_') \
+                and not func_name.startswith('set_dummy'):
+                    getattr(media_data_obj, func_name)(
+                        *self.setter_arg_dict[func_name]
+                    )
+
+            state_dict = media_data_obj.__getstate__()
+            self.assertEqual(
+                sorted(state_dict),
+                sorted(type(media_data_obj).db_iv_list),
+            )
+
+            # (Cache IVs are not saved in the database)
+            for iv in state_dict:
+                self.assertFalse(iv.startswith('_'))
+
+            new_obj = pickle.loads(pickle.dumps(media_data_obj))
+            self.check_all_slots_set(new_obj)
+
+            for iv in type(media_data_obj).db_iv_list:
+                self.assertEqual(
+                    self.convert_value(getattr(new_obj, iv)),
+                    self.convert_value(getattr(media_data_obj, iv)),
+                    '{} IV \'{}\' changed'.format(
+                        media_data_obj.get_type(),
+                        iv,
+                    ),
+                )
+
+
+if __name__ == '__main__':
+    unittest.main()